@@ -11,7 +11,10 @@ be appended like so: `<PREFIX>n.<output_format>`.
 For example, if the prefix is `stream` and the output format is `mp4` you might get `stream0.mp4`
 """
 OUTPUT_DIR_HELP = "Output directory path. Default is the name of the capture file"
-FAST_HELP = "Use threading to boost the decoding speed (use with caution)"
+FAST_HELP = (
+    "Use frame threading to boost the decoding speed (use with caution). "
+    "Encoding always uses frame threading"
+)
 FORMAT_HELP = "Output format (to get a list of output formats run `ffmpeg -formats`)"
 DEFAULT_CODEC_HELP_TEMPLATE = (
     "Default {} codec to fallback on if copying original codec fails "
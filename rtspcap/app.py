@@ -48,7 +48,8 @@ class RTSPcapApp:
     output_prefix: Optional string that will be prepended to each output file; Default is `stream`.
     output_dir: Optional oath to the directory which all the output files will be saved. Default
         is using the name of the capture file without the extension.
-    fast: Tells PyAV to use threading when decoding. Default is False.
+    fast: Tells PyAV to use frame threading when decoding (encoding always uses it).
+        Default is False.
     verbose: Print debug logs. Default is False.
     output_format: Output format of each output file. Default is `mp4`.
     default_vcodec: Default video codec to fallback on if if copying original codec fails.
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import re
 from av.codec import CodecContext
 from av.packet import Packet as AVPacket
 
@@ -6,6 +7,10 @@ from rtspcap.task import RTPPacket
 
 from typing import Dict, List, Optional, Tuple, Any
 
+# A `key=value` fmtp parameter; parameters are separated by `;`.
+# Whitespace around the key, the `=` and the value is not part of them.
+FMTP_PARAMETER_PATTERN = re.compile(r"\s*([^=;\s]+)\s*=\s*([^;]*?)\s*(?:;|$)")
+
 
 class CodecBase(ABC):
     @property
@@ -36,9 +41,6 @@ class CodecBase(ABC):
         if "fmtp" in sdp_media and len(sdp_media["fmtp"]) > 0:
             fmtp_data = sdp_media["fmtp"][0]
             if "config" in fmtp_data:
-                config = fmtp_data["config"]
-                parameters = config.split(";")
-                for parameter in parameters:
-                    key, value = parameter.split("=", 1)
-                    fmtp_config[key.strip().casefold()] = value
+                for key, value in FMTP_PARAMETER_PATTERN.findall(fmtp_data["config"]):
+                    fmtp_config[key.casefold()] = value
         return fmtp_config
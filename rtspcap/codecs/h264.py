@@ -1,5 +1,7 @@
 from base64 import b64decode
+from dataclasses import dataclass, field
 import logging
+import struct
 
 from rtspcap.codecs.codec_base import CodecBase
 
@@ -8,13 +10,27 @@ from av.packet import Packet as AVPacket
 
 from rtspcap.task import RTPPacket
 
-from typing import List, Optional, Tuple, Any
+from typing import Callable, List, Optional, Tuple, Any
 
 
 logger = logging.getLogger(__name__)
 
 H264_STARTING_SEQUENCE = b"\x00\x00\x00\x01"
 H264_INPUT_BUFFER_PADDING_SIZE = 64
+H264_INPUT_BUFFER_PADDING = b"\x00" * H264_INPUT_BUFFER_PADDING_SIZE
+H264_NAL_TYPE_MASK = 0x1F
+AGGREGATED_NAL_SIZE = struct.Struct(">H")
+# Every possible one byte `bytes` object, to avoid building NAL headers per packet
+SINGLE_BYTES = tuple(bytes((value,)) for value in range(256))
+H264_STAP_A_NAL_TYPE = 24
+H264_FU_A_NAL_TYPE = 28
+# Bounds the buffering for streams that never set the marker bit
+H264_MAX_ACCESS_UNIT_SIZE = 64 * 1024
+
+
+@dataclass
+class H264Context:
+    access_unit: bytearray = field(default_factory=bytearray)
 
 
 class CodecH264(CodecBase):
@@ -24,16 +40,16 @@ class CodecH264(CodecBase):
     @classmethod
     def get_codec_context(cls, sdp_media: dict) -> Tuple[CodecContext, Any]:
         fmtp = cls._parse_fmtp(sdp_media)
-        extradata = b""
+        extradata = bytearray()
         if "sprop-parameter-sets" in fmtp:
             for sprop_parameter_set in fmtp["sprop-parameter-sets"].split(","):
                 extradata += H264_STARTING_SEQUENCE
                 extradata += b64decode(sprop_parameter_set)
-                extradata += b"\x00" * H264_INPUT_BUFFER_PADDING_SIZE
+                extradata += H264_INPUT_BUFFER_PADDING
 
         codec_ctx = CodecContext.create(cls.AV_CODEC_NAME, "r")
-        codec_ctx.extradata = extradata
-        return codec_ctx, None
+        codec_ctx.extradata = bytes(extradata)
+        return codec_ctx, H264Context()
 
     # Taken from ffmpeg: `rtpdec_h264.c:h264_handle_packet`
     @classmethod
@@ -41,84 +57,132 @@ class CodecH264(CodecBase):
         cls,
         codec_ctx: CodecContext,
         packet: Optional[RTPPacket],
-        _: Any,
+        h264_ctx: H264Context,
     ) -> List[AVPacket]:
-        out_packets = []
+        """
+        The NAL units are collected until the end of the access unit (the marker bit)
+        and parsed together, instead of calling into the parser for every RTP packet.
+        """
         if packet is None:
-            return out_packets
+            # Flush what is left of the last access unit
+            return cls._parse_access_unit(codec_ctx, h264_ctx)
 
         buf = packet.payload
         if len(buf) == 0:
             logger.error(f"RTP h264 invalid data")
-            return out_packets
-
-        nal = buf[0]
-        nal_type = nal & 0x1F
-
-        if nal_type >= 1 and nal_type <= 23:
-            nal_type = 1
-
-        logger.debug(f"Parsing H264 RTP packet with NAL type {nal_type}")
-        if nal_type == 0 or nal_type == 1:
-            out_packets = codec_ctx.parse(H264_STARTING_SEQUENCE + buf)
-        elif nal_type == 24:
-            # One packet, multiple NALs
-            out_packets = cls.handle_aggregated_packet(codec_ctx, buf[1:])
-        elif nal_type == 28:
-            # Fragmented NAL
-            out_packets = cls._handle_fu_a_packet(codec_ctx, buf)
-        else:
+            return []
+
+        nal_type = buf[0] & H264_NAL_TYPE_MASK
+        logger.debug("Parsing H264 RTP packet with NAL type %d", nal_type)
+        handler = _NAL_HANDLERS[nal_type]
+        if handler is None:
             logger.error(f"Got H264 RTP packet with unsupported NAL type: {nal_type}")
+            return []
 
-        return out_packets
+        handler(h264_ctx.access_unit, buf)
+        if packet.marker or len(h264_ctx.access_unit) >= H264_MAX_ACCESS_UNIT_SIZE:
+            return cls._parse_access_unit(codec_ctx, h264_ctx)
 
-    @classmethod
-    def _handle_fu_a_packet(cls, codec_ctx: CodecContext, buf: bytes) -> List[AVPacket]:
-        if len(buf) < 3:
-            logger.error("Too short data for FU-A H.264 RTP packet")
-            return []
+        return []
 
-        fu_indicator = buf[0]
-        fu_header = buf[1]
-        start_bit = fu_header >> 7
-        nal_type = fu_header & 0x1F
-        nal = fu_indicator & 0xE0 | nal_type
+    @staticmethod
+    def _parse_access_unit(
+        codec_ctx: CodecContext, h264_ctx: H264Context
+    ) -> List[AVPacket]:
+        if not h264_ctx.access_unit:
+            return []
 
-        buf = buf[2:]
-        return cls.handle_frag_packet(
-            codec_ctx, buf, start_bit, nal.to_bytes(1, byteorder="little")
-        )
+        out_packets = codec_ctx.parse(h264_ctx.access_unit)
+        h264_ctx.access_unit.clear()
+        return out_packets
 
     @classmethod
     def handle_frag_packet(
         cls, codec_ctx: CodecContext, buf: bytes, start_bit: int, nal_header: bytes
     ) -> List[AVPacket]:
-        buffer_to_parse = b""
         if start_bit:
-            buffer_to_parse += H264_STARTING_SEQUENCE
-            buffer_to_parse += nal_header
-        buffer_to_parse += buf
+            return codec_ctx.parse(b"".join((H264_STARTING_SEQUENCE, nal_header, buf)))
+
+        # Continuation fragments go to the parser as is, without copying
+        return codec_ctx.parse(buf)
 
-        return codec_ctx.parse(buffer_to_parse)
+    @staticmethod
+    def append_frag_packet(
+        out: bytearray, buf: bytes, start_bit: int, nal_header: bytes
+    ) -> None:
+        if start_bit:
+            out += H264_STARTING_SEQUENCE
+            out += nal_header
+        out += buf
 
     @classmethod
     def handle_aggregated_packet(
         cls, codec_ctx: CodecContext, buf: bytes, skip_between: int = 0
     ) -> List[AVPacket]:
+        # All the NAL units are parsed together, as one Annex B buffer
+        nal_units = bytearray()
+        cls.append_aggregated_packet(nal_units, buf, skip_between)
+        if not nal_units:
+            return []
+
+        return codec_ctx.parse(nal_units)
+
+    @staticmethod
+    def append_aggregated_packet(
+        out: bytearray, buf: bytes, skip_between: int = 0
+    ) -> None:
         """
         An aggregated packet is an array of NAL units.
         A NAL unit is a `uint16 nal_size` followed by a buffer of that size
         """
-        out_packets = []
-        while len(buf) > 2:
-            nal_size_bytes = buf[:2]
-            nal_size = int.from_bytes(nal_size_bytes, byteorder="little")
-            buf = buf[2:]
-            if nal_size > len(buf):
-                logger.error(f"nal size exceeds length: {nal_size} > {len(buf)}")
+        buf_view = memoryview(buf)
+        buf_len = len(buf_view)
+        pos = 0
+        # Bind the globals used in the loop once
+        unpack_nal_size = AGGREGATED_NAL_SIZE.unpack_from
+        nal_size_length = AGGREGATED_NAL_SIZE.size
+        starting_sequence = H264_STARTING_SEQUENCE
+        while buf_len - pos > nal_size_length:
+            (nal_size,) = unpack_nal_size(buf_view, pos)
+            pos += nal_size_length
+            if nal_size > buf_len - pos:
+                logger.error(f"nal size exceeds length: {nal_size} > {buf_len - pos}")
                 break
 
-            out_packets += codec_ctx.parse(H264_STARTING_SEQUENCE + buf[:nal_size])
-            buf = buf[nal_size + skip_between :]
+            out += starting_sequence
+            out += buf_view[pos : pos + nal_size]
+            pos += nal_size + skip_between
 
-        return out_packets
+
+def _append_single_nal_packet(out: bytearray, buf: bytes) -> None:
+    out += H264_STARTING_SEQUENCE
+    out += buf
+
+
+def _append_stap_a_packet(out: bytearray, buf: bytes) -> None:
+    # One packet, multiple NALs
+    CodecH264.append_aggregated_packet(out, buf[1:])
+
+
+def _append_fu_a_packet(out: bytearray, buf: bytes) -> None:
+    if len(buf) < 3:
+        logger.error("Too short data for FU-A H.264 RTP packet")
+        return
+
+    fu_indicator = buf[0]
+    fu_header = buf[1]
+    start_bit = fu_header >> 7
+    nal_type = fu_header & 0x1F
+    nal = fu_indicator & 0xE0 | nal_type
+
+    buf = buf[2:]
+    CodecH264.append_frag_packet(out, buf, start_bit, SINGLE_BYTES[nal])
+
+
+# Handler per NAL type, indexed by the 5-bit type of the first payload byte.
+# Types 0-23 are single NAL unit packets; unsupported types map to None.
+_NAL_HANDLERS: List[Optional[Callable[[bytearray, bytes], None]]] = [
+    _append_single_nal_packet
+] * 24 + [None] * 8
+_NAL_HANDLERS[H264_STAP_A_NAL_TYPE] = _append_stap_a_packet
+_NAL_HANDLERS[H264_FU_A_NAL_TYPE] = _append_fu_a_packet
@@ -6,7 +6,7 @@ import logging
 from rtspcap.codecs.codec_base import CodecBase
 from rtspcap.codecs.h264 import CodecH264
 from rtspcap.codecs.h264 import H264_STARTING_SEQUENCE
-from rtspcap.codecs.h264 import H264_INPUT_BUFFER_PADDING_SIZE
+from rtspcap.codecs.h264 import H264_INPUT_BUFFER_PADDING
 
 from av.codec import CodecContext
 from av.packet import Packet as AVPacket
@@ -55,13 +55,13 @@ class CodecH265(CodecBase):
             logger.debug(f"Found profile-id: {profile_id}")
             h265_ctx.profile_id = profile_id
 
-        extradata = b""
+        extradata = bytearray()
         for sprop_attr in cls._SPROP_ATTRIBUTES:
             if sprop_attr in fmtp:
                 for sprop_parameter_set in fmtp[sprop_attr].split(","):
                     extradata += H264_STARTING_SEQUENCE
                     extradata += b64decode(sprop_parameter_set)
-                    extradata += b"\x00" * H264_INPUT_BUFFER_PADDING_SIZE
+                    extradata += H264_INPUT_BUFFER_PADDING
 
         if "sprop-max-don-diff" in fmtp and int(fmtp["sprop-max-don-diff"]):
             self.logger.debug("Found sprop-max-don-diff in SDP, using DON field")
@@ -71,7 +71,7 @@ class CodecH265(CodecBase):
             self.logger.debug("Found sprop-depack-buf-nalus in SDP, using DON field")
             h265_ctx.using_donl_field = True
 
-        codec_ctx.extradata = extradata
+        codec_ctx.extradata = bytes(extradata)
         return codec_ctx, h265_ctx
 
     @classmethod
@@ -112,11 +112,8 @@ class CodecH265(CodecBase):
         NUH layer ID (LayerId): 6 bits
         NUH temporal ID plus 1 (TID): 3 bits
         """
+        assert isinstance(h265_ctx, H265Context), "Expected H265 context"
         out_packets = []
-        if not isinstance(h265_ctx, H265Context):
-            logger.error("Expected H265 context")
-            return out_packets
-
         if packet is None:
             return out_packets
 
@@ -151,7 +148,7 @@ class CodecH265(CodecBase):
                 buf = buf[RTP_HEVC_DONL_FIELD_SIZE:]
                 skip_between = RTP_HEVC_DOND_FIELD_SIZE
 
-            out_packet += CodecH264.handle_aggregated_packet(
+            out_packets += CodecH264.handle_aggregated_packet(
                 codec_ctx, buf, skip_between
             )
         elif nal_type == 49:
@@ -180,7 +177,7 @@ class CodecH265(CodecBase):
             if h265_ctx.using_donl_field:
                 buf = buf[RTP_HEVC_DONL_FIELD_SIZE:]
 
-            logger.debug(f"FU type {fu_type} with {len(buf)} bytes")
+            logger.debug("FU type %d with %d bytes", fu_type, len(buf))
 
             if len(buf) == 0:
                 return out_packets
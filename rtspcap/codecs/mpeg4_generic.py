@@ -1,4 +1,5 @@
 import logging
+import struct
 from enum import Enum
 from dataclasses import dataclass, field
 
@@ -35,54 +36,43 @@ class AUHeader(NamedTuple):
     size: int = 0
     index: int = 0
 
-    # Maybe will use one day
-    cts_flag: int = 0
-    cts: int = 0
-    dts_flag: int = 0
-    dts: int = 0
-    rap_flag: int = 0
-    streamstate: int = 0
 
+AU_HEADERS_LENGTH = struct.Struct(">H")
 
-MAX_RTP_PACKET_LENGTH = 8192
+# AU header sizes in bits which can be read as whole big-endian words
+BYTE_ALIGNED_AU_HEADERS = {
+    8: struct.Struct(">B"),
+    16: struct.Struct(">H"),
+    32: struct.Struct(">I"),
+}
 
 
 @dataclass
 class AACContext:
     attributes: Dict[str, AACAttribute] = field(default_factory=dict)
-    buf: bytes = b""
+    buf: bytearray = field(default_factory=bytearray)
     expected_buf_size: int = 0
     timestamp: int = 0
 
 
 class GetBitContext:
+    """
+    Reads big-endian bit fields from a buffer. The buffer is converted to a single
+    integer once, so reading is a shift and a mask instead of a loop over bytes.
+    """
+
     def __init__(self, buffer: bytes):
-        self.buffer = buffer
+        self.value = int.from_bytes(buffer, byteorder="big")
+        self.size_in_bits = len(buffer) * 8
         self.bitpos = 0
 
     def get_bits(self, n: int) -> int:
-        result = 0
-        remaining_bits = n
-
-        while remaining_bits > 0:
-            if not len(self.buffer):
-                raise ValueError("End of buffer reached early")
-
-            current_byte = self.buffer[0]
-
-            bits_to_read = min(remaining_bits, 8 - self.bitpos)
-            mask = (1 << bits_to_read) - 1
-
-            result <<= bits_to_read
-            result |= (current_byte >> (8 - bits_to_read - self.bitpos)) & mask
-
-            remaining_bits -= bits_to_read
-            self.bitpos = (self.bitpos + bits_to_read) % 8
-
-            if self.bitpos == 0:
-                self.buffer = self.buffer[1:]
+        bits_left = self.size_in_bits - self.bitpos - n
+        if bits_left < 0:
+            raise ValueError("End of buffer reached early")
 
-        return result
+        self.bitpos += n
+        return (self.value >> bits_left) & ((1 << n) - 1)
 
 
 class CodecMPEG4_GENERIC(CodecBase):
@@ -187,11 +177,8 @@ class CodecMPEG4_GENERIC(CodecBase):
         payload contains either the final fragment of a fragmented Access
         Unit or one or more complete Access Units.
         """
+        assert isinstance(aac_ctx, AACContext), "Expected AAC context"
         out_packets = []
-        if not isinstance(aac_ctx, AACContext):
-            logger.error("Expected AAC context")
-            return out_packets
-
         if packet is None:
             return out_packets
 
@@ -204,22 +191,27 @@ class CodecMPEG4_GENERIC(CodecBase):
             logger.error(f"Error parsing AU headers: {str(e)}")
             return out_packets
 
-        buf = buf[au_headers_section_size:]
+        if not au_headers:
+            return out_packets
+
+        # The AUs are sliced out of a view of the data section, AVPacket copies them
+        buf = memoryview(buf)[au_headers_section_size:]
         if len(au_headers) == 1 and len(buf) < au_headers[0].size:
             # Packet is fragmented
-            logger.debug(f"Fragmented AU")
+            logger.debug("Fragmented AU")
             return cls._handle_fragmented_packet(aac_ctx, au_headers, packet, buf)
 
         # Assuming no auxiliiary section
-        logger.debug(f"Data section size: {len(buf)}")
+        logger.debug("Data section size: %d", len(buf))
+        au_start = 0
         for au_header in au_headers:
-            if len(buf) < au_header.size:
+            au_end = au_start + au_header.size
+            if au_end > len(buf):
                 logger.error("AU larger than packet size")
                 return out_packets
 
-            data = buf[: au_header.size]
-            buf = buf[au_header.size :]
-            out_packets.append(AVPacket(data))
+            out_packets.append(AVPacket(buf[au_start:au_end]))
+            au_start = au_end
 
         return out_packets
 
@@ -229,7 +221,7 @@ class CodecMPEG4_GENERIC(CodecBase):
         aac_ctx: AACContext,
         au_headers: List[AUHeader],
         packet: RTPPacket,
-        buf: bytes,
+        buf: memoryview,
     ) -> List[AVPacket]:
         out_packets = []
         if len(aac_ctx.buf) == 0:
@@ -247,7 +239,7 @@ class CodecMPEG4_GENERIC(CodecBase):
             or len(aac_ctx.buf) + len(buf) > cls.MAX_AAC_HBR_FRAME_SIZE
         ):
             aac_ctx.expected_buf_size = 0
-            aac_ctx.buf = bytes()
+            aac_ctx.buf.clear()
             logger.error("Invalid packet received")
             return out_packets
 
@@ -259,12 +251,13 @@ class CodecMPEG4_GENERIC(CodecBase):
 
         # Last fragment
         if len(aac_ctx.buf) != aac_ctx.expected_buf_size:
-            aac_ctx.buf = b""
+            aac_ctx.buf.clear()
             logger.error("Missed some packets, discarding frame")
             return out_packets
 
+        # The packet copies the data, so the buffer can be reused
         out_packets.append(AVPacket(aac_ctx.buf))
-        aac_ctx.buf = b""
+        aac_ctx.buf.clear()
         return out_packets
 
     @classmethod
@@ -285,55 +278,84 @@ class CodecMPEG4_GENERIC(CodecBase):
 
         returns: List of AU headers, size of AU-Headers-Section in bytes.
         """
-        if len(buf) < 2:
+        if len(buf) < AU_HEADERS_LENGTH.size:
             raise ValueError("Invalid Data")
 
         # Assuming the AU headers section exists
-        au_headers_length_in_bits = int.from_bytes(buf[:2], byteorder="big")
-        buf = buf[2:]
-        logger.debug(f"AU headers length in bits: {au_headers_length_in_bits}")
+        (au_headers_length_in_bits,) = AU_HEADERS_LENGTH.unpack_from(buf)
+        logger.debug("AU headers length in bits: %d", au_headers_length_in_bits)
 
         # Calculate size of AU headers including the padding bits
         au_headers_length_bytes = (au_headers_length_in_bits + 7) // 8
-        if au_headers_length_bytes > MAX_RTP_PACKET_LENGTH:
-            raise ValueError("Invalid AU headers length")
+        au_headers_section_size = AU_HEADERS_LENGTH.size + au_headers_length_bytes
 
-        au_headers_section_size = 2 + au_headers_length_bytes
-
-        if len(buf) < au_headers_length_bytes:
+        if len(buf) < au_headers_section_size:
             raise ValueError("Invalid Data")
 
-        get_bit_context = GetBitContext(buf[:au_headers_length_bytes])
-
         # Assuming only sizelength and indexlength fields exist in each AU header
         # and that indexlength == indexdeltalength
-        au_header_size_in_bits = (
-            aac_ctx.attributes["sizelength"] + aac_ctx.attributes["indexlength"]
-        )
-        logger.debug(f"AU header size in bits: {au_header_size_in_bits}")
+        sizelength = aac_ctx.attributes["sizelength"]
+        indexlength = aac_ctx.attributes["indexlength"]
+        au_header_size_in_bits = sizelength + indexlength
+        logger.debug("AU header size in bits: %d", au_header_size_in_bits)
+
+        if au_header_size_in_bits <= 0:
+            raise ValueError("Invalid AU header size")
 
         # FIXME: This is wrong if optional additional sections are present
-        if (
-            au_header_size_in_bits <= 0
-            or (au_headers_length_in_bits % au_header_size_in_bits) != 0
-        ):
+        number_of_au_headers, remaining_bits = divmod(
+            au_headers_length_in_bits, au_header_size_in_bits
+        )
+        if remaining_bits:
             raise ValueError("Invalid AU header size")
 
-        number_of_au_headers = au_headers_length_in_bits // au_header_size_in_bits
-        current_index = 0
-        au_headers = []
-        for i in range(number_of_au_headers):
-            size = get_bit_context.get_bits(aac_ctx.attributes["sizelength"])
-            index = get_bit_context.get_bits(aac_ctx.attributes["indexlength"])
-            if i == 0:
-                current_index = index
-            else:
-                if index != 0:
-                    raise ValueError("Interleaving not supported")
-                current_index += index + 1
-            au_header = AUHeader(size=size, index=current_index)
-            logger.debug(f"Found AU Header: {au_header}")
-
-            au_headers.append(au_header)
+        au_header_fields = cls._read_au_header_fields(
+            buf[AU_HEADERS_LENGTH.size : au_headers_section_size],
+            number_of_au_headers,
+            sizelength,
+            indexlength,
+        )
+
+        if not au_header_fields:
+            return [], au_headers_section_size
+
+        # Only the first AU header has an index, the rest have an index delta
+        # which must be 0 without interleaving, so the AUs are consecutive
+        if any(index_delta for _, index_delta in au_header_fields[1:]):
+            raise ValueError("Interleaving not supported")
+
+        first_index = au_header_fields[0][1]
+        au_headers = [
+            AUHeader(size=size, index=first_index + i)
+            for i, (size, _) in enumerate(au_header_fields)
+        ]
+        logger.debug("Found AU Headers: %s", au_headers)
 
         return au_headers, au_headers_section_size
+
+    @staticmethod
+    def _read_au_header_fields(
+        buf: bytes, number_of_au_headers: int, sizelength: int, indexlength: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Read the (size, index) fields of each AU header.
+        returns: List of (size, index) tuples.
+        """
+        au_header_struct = BYTE_ALIGNED_AU_HEADERS.get(sizelength + indexlength)
+        if au_header_struct is not None:
+            # The common case (e.g. AAC-hbr, sizelength=13 and indexlength=3):
+            # every AU header is exactly one big-endian word
+            index_mask = (1 << indexlength) - 1
+            return [
+                (word >> indexlength, word & index_mask)
+                for (word,) in au_header_struct.iter_unpack(buf)
+            ]
+
+        get_bit_context = GetBitContext(buf)
+        return [
+            (
+                get_bit_context.get_bits(sizelength),
+                get_bit_context.get_bits(indexlength),
+            )
+            for _ in range(number_of_au_headers)
+        ]
@@ -1,5 +1,6 @@
 import logging
 
+from av.error import FFmpegError
 from av.packet import Packet as AVPacket
 from av.frame import Frame
 
@@ -38,9 +39,13 @@ class RTPCodec:
             sdp_media
         )
         self._codec_type = self._codec_ctx.type
+        # Bound once, this is called for every RTP packet
+        self._handle_codec_packet = self._codec.handle_packet
 
-        if fast:
-            self._codec_ctx.thread_type = "AUTO"
+        # Slice threading on all cores doesn't add decoding delay, unlike frame
+        # threading which `AUTO` may pick and which delays one frame per thread
+        self._codec_ctx.thread_type = "AUTO" if fast else "SLICE"
+        self._codec_ctx.thread_count = 0
 
     @property
     def codec_name(self) -> str:
@@ -77,13 +82,12 @@ class RTPCodec:
         self,
         packet: RTPPacket,
     ) -> List[AVPacket]:
-        return self._codec.handle_packet(self._codec_ctx, packet, self._payload_context)
+        return self._handle_codec_packet(self._codec_ctx, packet, self._payload_context)
 
     def decode(self, av_packet: Optional[AVPacket] = None) -> List[Frame]:
-        out_frames = []
         try:
-            out_frames = self._codec_ctx.decode(av_packet)
-        except Exception as e:
-            self.logger.debug(f"Failed decoding with {e}")
-        finally:
-            return out_frames
+            return self._codec_ctx.decode(av_packet)
+        except FFmpegError as e:
+            # Corrupt or incomplete data (e.g. after packet loss) is expected
+            self.logger.debug("Failed decoding with %s", e)
+            return []
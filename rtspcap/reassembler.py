@@ -1,6 +1,18 @@
+from collections import deque
+import heapq
 import logging
 
-from typing import TypeVar, Generic, Dict, Optional, List, Iterator, Tuple, Literal
+from typing import (
+    TypeVar,
+    Generic,
+    Deque,
+    Dict,
+    Optional,
+    List,
+    Iterator,
+    Tuple,
+    Literal,
+)
 
 T = TypeVar("T")
 
@@ -22,33 +34,62 @@ class Reassembler(Generic[T]):
     ):
         self.logger = logging.getLogger(__name__)
         self._seq_bit_size = seq_bit_size
+        self._seq_mask = (1 << seq_bit_size) - 1
+        self._half_seq_range = 1 << (seq_bit_size - 1)
         self._max_out_of_order = max_out_of_order
         assert mode in ("packet", "data")
-        self._mode = mode
+        self._data_mode = mode == "data"
+        # The expected seq and the keys of the out-of-order packets are not wrapped
+        # around, so they keep their order when the sequence number wraps around
         self._out_of_order_packets: Dict[int, T] = {}
+        # Min-heap of the keys of `_out_of_order_packets`. Keys that were already
+        # popped from the dict are removed from the heap lazily.
+        self._out_of_order_seqs: List[int] = []
         self._expected_seq: Optional[int] = None
-        self._output_queue: List[Tuple[Optional[T], bool]] = []
+        self._output_queue: Deque[Tuple[Optional[T], bool]] = deque()
         self._done: bool = False
 
     def get_output_packets(self) -> Iterator[Tuple[Optional[T], bool]]:
         while self._output_queue:
-            packet_and_skipped = self._output_queue.pop(0)
+            packet_and_skipped = self._output_queue.popleft()
             yield packet_and_skipped
 
     def get_output_packet(self) -> Tuple[Optional[T], bool]:
         if not self._output_queue:
             raise EmptyQueueException("Output queue is empty")
 
-        return self._output_queue.pop(0)
+        return self._output_queue.popleft()
 
     def _increment_expected_seq(self, packet: T) -> None:
-        if self._mode == "packet":
-            seq_size = 1
-        elif self._mode == "data":
-            seq_size = len(packet)
-
+        seq_size = len(packet) if self._data_mode else 1
         self._expected_seq += seq_size
-        self._expected_seq %= 1 << self._seq_bit_size
+
+    def _store_out_of_order_packet(self, packet: T, seq: int) -> None:
+        if seq not in self._out_of_order_packets:
+            heapq.heappush(self._out_of_order_seqs, seq)
+
+        self._out_of_order_packets[seq] = packet
+
+    def _get_earliest_out_of_order_seq(self) -> int:
+        assert self._out_of_order_packets
+        while self._out_of_order_seqs[0] not in self._out_of_order_packets:
+            heapq.heappop(self._out_of_order_seqs)
+
+        return self._out_of_order_seqs[0]
+
+    def _flush_in_order_packets(self) -> None:
+        """Output the stored packets that continue the expected sequence"""
+        out_of_order_packets = self._out_of_order_packets
+        append_output = self._output_queue.append
+        increment_expected_seq = self._increment_expected_seq
+        while self._expected_seq in out_of_order_packets:
+            next_packet = out_of_order_packets.pop(self._expected_seq)
+            append_output((next_packet, False))
+            increment_expected_seq(next_packet)
+
+        # Drop the stale heap entries once nothing is stored on the side
+        if not self._out_of_order_packets:
+            self._out_of_order_seqs.clear()
 
     def process(self, packet: Optional[T], seq: int = -1) -> None:
         """
@@ -60,16 +101,17 @@ class Reassembler(Generic[T]):
 
         if self._expected_seq is None:
             self._expected_seq = seq
-            self.logger.debug(f"First seq is {self._expected_seq}")
+            self.logger.debug("First seq is %d", seq)
 
         # Dump all remaining packets at the end
         if packet is None:
             self._done = True
             while self._out_of_order_packets:
-                earliest_packet_seq = min(self._out_of_order_packets.keys())
+                earliest_packet_seq = self._get_earliest_out_of_order_seq()
                 skipped = earliest_packet_seq != self._expected_seq
                 self.logger.debug(
-                    f"Out of order packet with seq {earliest_packet_seq} found after the end of the packets; Appending to the end"
+                    "Out of order packet with seq %d found after the end of the packets; Appending to the end",
+                    earliest_packet_seq & self._seq_mask,
                 )
                 packet = self._out_of_order_packets.pop(earliest_packet_seq)
                 self._output_queue.append((packet, skipped))
@@ -78,35 +120,43 @@ class Reassembler(Generic[T]):
 
                 self._increment_expected_seq(packet)
 
+            self._out_of_order_seqs.clear()
             self._output_queue.append((None, False))
             return
 
+        # Serial number arithmetic (RFC 1982): packets less than half the sequence
+        # range ahead of the expected seq are in the future, the rest are in the past
+        seq_delta = (seq - self._expected_seq) & self._seq_mask
+
+        # The common case: the expected packet, with nothing stored on the side
+        if seq_delta == 0 and not self._out_of_order_packets:
+            self._output_queue.append((packet, False))
+            self._increment_expected_seq(packet)
+            return
+
         # If an out-of-order packet was given, save it to the side until max_out_of_order
-        # packets are reached. Then, rebase the expected seq and dump all applicable packets
-        if seq != self._expected_seq:
-            if seq > self._expected_seq:
-                self._out_of_order_packets[seq] = packet
+        # packets are reached. Then, rebase the expected seq to the earliest saved packet
+        if seq_delta != 0:
+            if seq_delta < self._half_seq_range:
+                self._store_out_of_order_packet(packet, self._expected_seq + seq_delta)
 
             if len(self._out_of_order_packets) < self._max_out_of_order:
                 return
 
             self.logger.debug(
-                f"Could not find packet with sequence number {self._expected_seq}; Likely packet loss"
+                "Could not find packet with sequence number %d; Likely packet loss",
+                self._expected_seq & self._seq_mask,
             )
 
-            self._expected_seq = min(self._out_of_order_packets.keys())
+            self._expected_seq = self._get_earliest_out_of_order_seq()
             next_packet = self._out_of_order_packets.pop(self._expected_seq)
             self._output_queue.append((next_packet, True))
-            while True:
-                self._increment_expected_seq(next_packet)
-                if self._expected_seq not in self._out_of_order_packets:
-                    break
-
-                next_packet = self._out_of_order_packets.pop(self._expected_seq)
-                self._output_queue.append((next_packet, False))
-
-            return
+            self._increment_expected_seq(next_packet)
 
         # Else, put the packet in the output queue
-        self._output_queue.append((packet, False))
-        self._increment_expected_seq(packet)
+        else:
+            self._output_queue.append((packet, False))
+            self._increment_expected_seq(packet)
+
+        # Either way, dump all the saved packets that are now in order
+        self._flush_in_order_packets()
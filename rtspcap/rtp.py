@@ -1,16 +1,18 @@
+from collections import deque
 import logging
 
 import av
 from av.container import Container
 from av.stream import Stream
 from av.frame import Frame
+from av.packet import Packet as AVPacket
 
 from rtspcap.sdp import get_codec_name_from_sdp_media
 from rtspcap.rtp_packet import RTPPacket
 from rtspcap.reassembler import Reassembler
 from rtspcap.codecs.rtp_codec import RTPCodec
 
-from typing import Optional, List
+from typing import Deque, Optional, List
 
 
 class RTPDecoder:
@@ -36,7 +38,7 @@ class RTPDecoder:
         self._force_acodec = force_acodec
         self._fast = fast
         self._error: bool = False
-        self._frame_buffer: List[Frame] = []
+        self._frame_buffer: Deque[Frame] = deque()
         self._out_stream: Optional[Stream] = None
 
         codec_name = get_codec_name_from_sdp_media(sdp_media)
@@ -56,10 +58,12 @@ class RTPDecoder:
         if self._out_stream is None and self._frame_buffer:
             self.logger.debug("Could not get input codec settings, using defaults")
             self._init_out_stream()
+            encode = self._out_stream.encode
+            encoded_packets: List[AVPacket] = []
             for frame in self._frame_buffer:
-                encoded_packets = self._out_stream.encode(frame)
-                self._container.mux(encoded_packets)
+                encoded_packets += encode(frame)
 
+            self._container.mux(encoded_packets)
             self._frame_buffer.clear()
 
         self._reassembler.process(None)
@@ -73,39 +77,48 @@ class RTPDecoder:
 
     def process_rtp_packet(self, rtp_packet: RTPPacket) -> None:
         self._reassembler.process(rtp_packet, rtp_packet.seq)
+        handle_packet = self._handle_packet
         for out_packet, skipped in self._reassembler.get_output_packets():
-            self._handle_packet(out_packet)
+            handle_packet(out_packet)
 
     def _handle_packet(
         self,
         packet: Optional[RTPPacket],
     ) -> None:
         out_packets = self._stream_codec.handle_packet(packet)
-        self.logger.debug(f"Parsed {len(out_packets)} packets")
+        self.logger.debug("Parsed %d packets", len(out_packets))
 
+        # Bind the per-frame methods once, this is the hot path
+        decode = self._stream_codec.decode
+        encode = self._out_stream.encode if self._out_stream is not None else None
+        encoded_packets: List[AVPacket] = []
         for out_packet in out_packets:
-            frames = self._stream_codec.decode(out_packet)
-            self.logger.debug(f"Decoded {len(frames)} frames")
-
+            frames = decode(out_packet)
             if self._out_stream is None:
+                self._frame_buffer.extend(frames)
                 if not self._stream_codec.ready:
-                    self._frame_buffer += frames
                     if len(self._frame_buffer) >= self.FRAME_BUFFER_SIZE:
                         self.logger.info("Frame buffer is full, using default settings")
                     else:
                         continue
 
                 self._init_out_stream()
-                frames = self._frame_buffer + frames
-                self._frame_buffer.clear()
+                encode = self._out_stream.encode
+                frames, self._frame_buffer = self._frame_buffer, deque()
 
             for frame in frames:
                 try:
-                    encoded_packets = self._out_stream.encode(frame)
-                    self._container.mux(encoded_packets)
+                    encoded_packets += encode(frame)
                 except Exception as e:
                     self.logger.error(e)
 
+        # Mux everything encoded from this RTP packet in a single call
+        if encoded_packets:
+            try:
+                self._container.mux(encoded_packets)
+            except Exception as e:
+                self.logger.error(e)
+
     def _init_out_stream(self) -> None:
         assert self._stream_codec.codec_type in ("video", "audio")
         if self._stream_codec.codec_type == "video":
@@ -165,8 +178,9 @@ class RTPDecoder:
                     "Could not get original sample rate, using codec default"
                 )
 
-        if self._fast:
-            self._out_stream.thread_type = "AUTO"
+        # Frame threading only delays the encoded packets, which are flushed on
+        # close, so unlike decoding it is safe to always enable it
+        self._out_stream.thread_type = "AUTO"
 
     def _flush_encoder(self) -> None:
         if self._out_stream is None:
@@ -1,6 +1,19 @@
-from dpkt.rtp import RTP
+import struct
 
-from typing import NamedTuple
+from typing import NamedTuple, Union
+
+# Version, padding, extension and CSRC count; marker and payload type;
+# sequence number; timestamp; SSRC
+RTP_HEADER = struct.Struct(">BBHII")
+RTP_HEADER_EXTENSION = struct.Struct(">HH")
+RTP_VERSION = 2
+RTP_VERSION_SHIFT = 6
+RTP_CSRC_SIZE = 4
+RTP_PADDING_MASK = 0x20
+RTP_EXTENSION_MASK = 0x10
+RTP_CSRC_COUNT_MASK = 0x0F
+RTP_MARKER_MASK = 0x80
+RTP_PAYLOAD_TYPE_MASK = 0x7F
 
 
 class RTPPacket(NamedTuple):
@@ -12,17 +25,42 @@ class RTPPacket(NamedTuple):
     payload: bytes
 
     @classmethod
-    def from_dpkt(cls, packet: RTP) -> "RTPPacket":
-        data = packet.data
-        if packet.p and data:
-            padding_length = data[-1]
-            data = data[:-padding_length]
+    def from_bytes(cls, buf: Union[bytes, memoryview]) -> "RTPPacket":
+        """
+        Parse an RTP packet according to section 5.1 of RFC 3550.
+        The CSRC list and the header extension are skipped, and the padding is removed.
+        """
+        if len(buf) < RTP_HEADER.size:
+            raise ValueError(f"Too short RTP packet, got {len(buf)} bytes")
+
+        first_byte, second_byte, seq, timestamp, ssrc = RTP_HEADER.unpack_from(buf)
+        version = first_byte >> RTP_VERSION_SHIFT
+        if version != RTP_VERSION:
+            raise ValueError(f"Unexpected RTP version {version}")
+
+        payload_start = (
+            RTP_HEADER.size + (first_byte & RTP_CSRC_COUNT_MASK) * RTP_CSRC_SIZE
+        )
+
+        if first_byte & RTP_EXTENSION_MASK:
+            if len(buf) < payload_start + RTP_HEADER_EXTENSION.size:
+                raise ValueError("Too short RTP packet for its header extension")
+
+            _, extension_length = RTP_HEADER_EXTENSION.unpack_from(buf, payload_start)
+            payload_start += RTP_HEADER_EXTENSION.size + extension_length * 4
+
+        if payload_start > len(buf):
+            raise ValueError("RTP header is longer than the packet")
+
+        payload_end = len(buf)
+        if first_byte & RTP_PADDING_MASK and payload_end > payload_start:
+            payload_end -= buf[-1]
 
         return cls(
-            marker=bool(packet.m),
-            payload_type=packet.pt,
-            seq=packet.seq,
-            timestamp=packet.ts,
-            ssrc=packet.ssrc,
-            payload=data,
+            marker=bool(second_byte & RTP_MARKER_MASK),
+            payload_type=second_byte & RTP_PAYLOAD_TYPE_MASK,
+            seq=seq,
+            timestamp=timestamp,
+            ssrc=ssrc,
+            payload=bytes(buf[payload_start:payload_end]),
         )
@@ -2,12 +2,12 @@ from enum import Enum
 import logging
 
 from dpkt.pcap import UniversalReader
-from dpkt.ethernet import Ethernet
+from dpkt.ethernet import Ethernet, ETH_HDR_LEN, ETH_TYPE_IP
 from dpkt.ip import IP
 from dpkt.tcp import TCP, TH_FIN, TH_URG
 from dpkt.udp import UDP
-from dpkt.rtp import RTP
 from dpkt.utils import inet_to_str
+from dpkt.dpkt import UnpackError
 
 import sdp_transform
 
@@ -17,7 +17,7 @@ from rtspcap.rtsp_session import (
     RTSP_PORTS,
     RTSPTransportHeader,
 )
-from rtspcap.sdp import get_sdp_medias, get_payload_type_from_sdp_media
+from rtspcap.sdp import get_sdp_medias
 from rtspcap.task import (
     Task,
     TaskType,
@@ -26,7 +26,7 @@ from rtspcap.task import (
 )
 from rtspcap.rtp_packet import RTPPacket
 
-from typing import NamedTuple, Dict, Tuple, List, Optional, Iterator, Set
+from typing import NamedTuple, Dict, Tuple, List, Optional, Iterator, Set, Container
 
 
 class IPProto(Enum):
@@ -62,6 +62,11 @@ class FiveTuple(NamedTuple):
 
 RTPID = Tuple[FiveTuple, int, int]  # Five tuple, ssrc and payload type
 
+ETH_TYPE_OFFSET = 12
+IP_PROTO_OFFSET = 9
+IP_IHL_MASK = 0x0F
+TRANSPORT_PORT_LEN = 2
+
 
 class RTSPDataExtractor:
     """
@@ -86,14 +91,8 @@ class RTSPDataExtractor:
             timestamp: float
             buf: bytes
             for timestamp, buf in capture:
-                # Assume layer 2 is Ethernet
-                eth_layer = Ethernet(buf)
-
-                if not isinstance(eth_layer.data, IP):
-                    continue
-
-                ip_layer = eth_layer.data
-                if not isinstance(ip_layer.data, TCP):
+                ip_layer = self._get_ip_layer(buf, IPProto.TCP, RTSP_PORTS)
+                if ip_layer is None or not isinstance(ip_layer.data, TCP):
                     continue
 
                 if ip_layer.data.sport not in RTSP_PORTS:
@@ -134,46 +133,88 @@ class RTSPDataExtractor:
                 if five_tuple in self._rtp_over_tcp_sessions:
                     yield from self._process_rtp_over_tcp(five_tuple, rtsp_session)
 
+            # The TCP sessions are all done; Release their reassembly buffers before
+            # the UDP pass. The sessions that have RTP/UDP streams are still
+            # referenced by `_rtp_over_udp_sessions`.
+            rtsp_sessions.clear()
+            self._rtp_over_tcp_sessions.clear()
+
+            # No need to read the whole capture again if there are no UDP streams
+            if not self._rtp_over_udp_sessions:
+                return
+
             # Reiterate over the capture to handle all the UDP streams.
             # The reason we need another iteration is so we don't miss
             # any packets because the TCP reassembly didn't catch up
             # to the processing.
             f.seek(0)
             capture = UniversalReader(f)
+            rtp_server_ports = {
+                rtp_five_tuple.src_port
+                for rtp_five_tuple in self._rtp_over_udp_sessions
+            }
             for timestamp, buf in capture:
-                # Assume layer 2 is Ethernet
-                eth_layer = Ethernet(buf)
-
-                if not isinstance(eth_layer.data, IP):
-                    continue
-
-                ip_layer = eth_layer.data
-                if not isinstance(ip_layer.data, UDP):
+                ip_layer = self._get_ip_layer(buf, IPProto.UDP, rtp_server_ports)
+                if ip_layer is None or not isinstance(ip_layer.data, UDP):
                     continue
 
+                # The RTP/UDP sessions are keyed by the full five tuple (server to
+                # client), so a single lookup demultiplexes the packet to its track.
                 five_tuple = FiveTuple.from_dpkt(ip_layer)
-
-                if five_tuple not in self._rtp_over_udp_sessions:
-                    continue
-
-                rtsp_session = self._rtp_over_udp_sessions[five_tuple]
-                if (
-                    inet_to_str(ip_layer.src) != rtsp_session.server_ip
-                    or inet_to_str(ip_layer.dst) != rtsp_session.client_ip
-                ):
+                rtsp_session = self._rtp_over_udp_sessions.get(five_tuple)
+                if rtsp_session is None:
                     continue
 
                 udp_layer = ip_layer.data
 
                 try:
-                    dpkt_rtp = RTP(udp_layer.data)
-                except Exception as e:
+                    rtp_packet = RTPPacket.from_bytes(udp_layer.data)
+                except ValueError as e:
                     self.logger.error(f"Could not parse RTP packet: {e}")
                     continue
 
-                rtp_packet = RTPPacket.from_dpkt(dpkt_rtp)
                 yield from self._handle_rtp_packet(rtsp_session, five_tuple, rtp_packet)
 
+    @staticmethod
+    def _get_ip_layer(
+        buf: bytes, proto: IPProto, src_ports: Container[int]
+    ) -> Optional[IP]:
+        """
+        Get the IP layer of a captured frame, but only if it carries `proto`
+        from one of `src_ports`.
+
+        Assume layer 2 is Ethernet. For plain IPv4 frames the protocol and the
+        source port are checked on the raw bytes (like a BPF filter would), so
+        frames we don't care about are never decoded by dpkt.
+        Anything else (VLAN tags and such) falls back to a full Ethernet decode,
+        and the caller is expected to check the ports itself.
+        """
+        if (
+            len(buf) > ETH_HDR_LEN + IP_PROTO_OFFSET
+            and int.from_bytes(buf[ETH_TYPE_OFFSET:ETH_HDR_LEN], byteorder="big")
+            == ETH_TYPE_IP
+        ):
+            if buf[ETH_HDR_LEN + IP_PROTO_OFFSET] != proto.value:
+                return None
+
+            sport_offset = ETH_HDR_LEN + ((buf[ETH_HDR_LEN] & IP_IHL_MASK) << 2)
+            sport = int.from_bytes(
+                buf[sport_offset : sport_offset + TRANSPORT_PORT_LEN], byteorder="big"
+            )
+            if sport not in src_ports:
+                return None
+
+            try:
+                return IP(buf[ETH_HDR_LEN:])
+            except UnpackError:
+                return None
+
+        eth_layer = Ethernet(buf)
+        if not isinstance(eth_layer.data, IP):
+            return None
+
+        return eth_layer.data
+
     def _handle_rtsp_session(
         self, five_tuple: FiveTuple, rtsp_session: RTSPSession
     ) -> None:
@@ -251,7 +292,7 @@ class RTSPDataExtractor:
             ident = self._rtp_id_to_ident[rtpid]
         except KeyError:
             sdp_media = self._get_sdp_media_for_rtp_stream(
-                rtsp_session.sdp, rtp_packet.payload_type
+                rtsp_session, rtp_packet.payload_type
             )
 
             if sdp_media is None:
@@ -290,7 +331,9 @@ class RTSPDataExtractor:
         return ident
 
     @staticmethod
-    def _get_sdp_media_for_rtp_stream(sdp: dict, payload_type: int) -> Optional[dict]:
-        for sdp_media in get_sdp_medias(sdp):
-            if get_payload_type_from_sdp_media(sdp_media) == payload_type:
-                return sdp_media
+    def _get_sdp_media_for_rtp_stream(
+        rtsp_session: RTSPSession, payload_type: int
+    ) -> Optional[dict]:
+        # Packets with an unknown payload type keep coming back here, so the session
+        # maps the payload types once when it parses the SDP
+        return rtsp_session.sdp_medias_by_payload_type.get(payload_type)
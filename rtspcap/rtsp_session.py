@@ -1,9 +1,9 @@
 from enum import Enum
 import logging
+import struct
 
 from dpkt.ip import IP
 from dpkt.tcp import TCP, TH_URG, TH_FIN
-from dpkt.rtp import RTP
 from dpkt.utils import inet_to_str
 from dpkt.dpkt import UnpackError, NeedData
 
@@ -11,7 +11,7 @@ import sdp_transform
 
 from rtspcap.reassembler import Reassembler, EmptyQueueException
 from rtspcap.dpkt_helpers.rtsp import RTSPResponse
-from rtspcap.sdp import get_sdp_medias
+from rtspcap.sdp import get_sdp_medias, get_sdp_medias_by_payload_type
 from rtspcap.rtp_packet import RTPPacket
 
 from typing import NamedTuple, Optional, Dict, Iterator, List, Tuple
@@ -20,7 +20,9 @@ TCP_SEQ_SIZE_IN_BITS = 4 * 8
 RTSP_PORTS = (554, 8554, 7236)  # Taken from wireshark
 MIN_RTP_SIZE = 12
 MAX_RTP_SIZE = 8192
-INTERLEAVED_HEADER_LEN = 4
+# Magic, channel and length
+INTERLEAVED_HEADER = struct.Struct(">BBH")
+INTERLEAVED_HEADER_LEN = INTERLEAVED_HEADER.size
 INTERLEAVED_HEADER_MAGIC = 0x24
 
 
@@ -56,6 +58,7 @@ class RTSPSession:
         self.server_ip: Optional[str] = None
         self.client_ip: Optional[str] = None
         self.sdp: Optional[dict] = None
+        self.sdp_medias_by_payload_type: Dict[int, dict] = {}
         self.transport_headers: List[RTSPTransportHeader] = []
         self.control_channels: List[int] = []
         self.data_channels: List[int] = []
@@ -65,6 +68,7 @@ class RTSPSession:
         )
         self._state: RTSPSessionState = RTSPSessionState.PROCESSING_RTSP
         self._buffer: bytes = b""
+        self._rtp_buffer = bytearray()
         self._current_channel: int = -1
         self._current_rtp_length: int = -1
 
@@ -159,7 +163,8 @@ class RTSPSession:
             and "content-type" in rtsp_response.headers
             and rtsp_response.headers["content-type"].casefold() == "application/sdp"
         ):
-            self.sdp = sdp_transform.parse(rtsp_response.body.decode())
+            self.sdp = sdp_transform.parse(rtsp_response.body.decode(errors="replace"))
+            self.sdp_medias_by_payload_type = get_sdp_medias_by_payload_type(self.sdp)
 
         # SETUP response
         elif "transport" in rtsp_response.headers and int(rtsp_response.status) == 200:
@@ -172,12 +177,9 @@ class RTSPSession:
                 self._state = RTSPSessionState.DONE
 
     @staticmethod
-    def _parse_interleaved_header(header: bytes) -> Tuple[int, int, int]:
+    def _parse_interleaved_header(header: bytearray) -> Tuple[int, int, int]:
         assert len(header) >= INTERLEAVED_HEADER_LEN
-        magic = header[0]
-        channel = header[1]
-        length = int.from_bytes(header[2:4], byteorder="big")
-        return magic, channel, length
+        return INTERLEAVED_HEADER.unpack_from(header)
 
     def _valid_interleaved_header(self, magic, channel, length) -> bool:
         if (
@@ -197,81 +199,81 @@ class RTSPSession:
             self._buffer = b""
             self._state = RTSPSessionState.PROCESSING_RTP
 
+        # Interleaved data is consumed from the front of the buffer, which is cheap
+        # for a bytearray, instead of re-slicing an immutable buffer every packet
+        buffer = self._rtp_buffer
         for out_packet, skipped in self._reassembler.get_output_packets():
             if not out_packet:
                 out_packet = b""
                 skipped = True
 
             if skipped:
-                if len(self._buffer) < INTERLEAVED_HEADER_LEN:
-                    self._buffer = b""
+                if len(buffer) < INTERLEAVED_HEADER_LEN:
+                    buffer.clear()
                 else:
-                    magic, channel, length = self._parse_interleaved_header(
-                        self._buffer
-                    )
+                    magic, channel, length = self._parse_interleaved_header(buffer)
                     if self._valid_interleaved_header(magic, channel, length):
-                        payload = self._buffer[INTERLEAVED_HEADER_LEN:]
-                        padding = b"\x00" * (length - len(payload))
-                        self._buffer += padding
+                        payload_length = len(buffer) - INTERLEAVED_HEADER_LEN
+                        buffer += b"\x00" * (length - payload_length)
                     else:
-                        self._buffer = b""
+                        buffer.clear()
 
-                if INTERLEAVED_HEADER_MAGIC in out_packet:
-                    self._buffer += out_packet[
-                        out_packet.find(INTERLEAVED_HEADER_MAGIC) :
-                    ]
+                magic_index = out_packet.find(INTERLEAVED_HEADER_MAGIC)
+                if magic_index >= 0:
+                    buffer += out_packet[magic_index:]
 
-                if not self._buffer:
+                if not buffer:
                     continue
 
             else:
-                self._buffer += out_packet
+                buffer += out_packet
 
             while True:
-                if len(self._buffer) < INTERLEAVED_HEADER_LEN:
+                if len(buffer) < INTERLEAVED_HEADER_LEN:
                     break
 
-                magic, channel, length = self._parse_interleaved_header(self._buffer)
+                magic, channel, length = self._parse_interleaved_header(buffer)
 
                 if not self._valid_interleaved_header(magic, channel, length):
-                    next_magic_index = self._buffer[1:].find(INTERLEAVED_HEADER_MAGIC)
+                    next_magic_index = buffer.find(INTERLEAVED_HEADER_MAGIC, 1)
                     if next_magic_index < 0:
-                        self._buffer = b""
+                        buffer.clear()
                         break
 
-                    self._buffer = self._buffer[next_magic_index + 1 :]
-                elif len(self._buffer[INTERLEAVED_HEADER_LEN:]) < length:
+                    del buffer[:next_magic_index]
+                elif len(buffer) - INTERLEAVED_HEADER_LEN < length:
                     break
                 else:
                     if channel in self.data_channels:
-                        rtp_packet = RTPPacket.from_dpkt(
-                            RTP(
-                                self._buffer[
-                                    INTERLEAVED_HEADER_LEN : INTERLEAVED_HEADER_LEN
-                                    + length
-                                ]
-                            )
-                        )
-                        if rtp_packet.payload:
-                            yield rtp_packet
+                        try:
+                            with memoryview(buffer) as buffer_view:
+                                rtp_packet = RTPPacket.from_bytes(
+                                    buffer_view[
+                                        INTERLEAVED_HEADER_LEN : INTERLEAVED_HEADER_LEN
+                                        + length
+                                    ]
+                                )
+                        except ValueError as e:
+                            self.logger.error(f"Could not parse RTP packet: {e}")
+                        else:
+                            if rtp_packet.payload:
+                                yield rtp_packet
 
                     # Some badly coded devices will report a length longer than the RTP packet
                     length_is_fake = False
                     if self._assume_tcp_length_is_fake:
                         length_is_fake = True
-                        if len(self._buffer) > INTERLEAVED_HEADER_LEN + length:
+                        if len(buffer) > INTERLEAVED_HEADER_LEN + length:
                             length_is_fake = (
-                                self._buffer[INTERLEAVED_HEADER_LEN + length]
+                                buffer[INTERLEAVED_HEADER_LEN + length]
                                 != INTERLEAVED_HEADER_MAGIC
                             )
 
                     if length_is_fake:
-                        next_magic_index = self._buffer[1:].find(
-                            INTERLEAVED_HEADER_MAGIC
-                        )
+                        next_magic_index = buffer.find(INTERLEAVED_HEADER_MAGIC, 1)
                         if next_magic_index < 0:
-                            self._buffer = b""
+                            buffer.clear()
                         else:
-                            self._buffer = self._buffer[next_magic_index + 1 :]
+                            del buffer[:next_magic_index]
                     else:
-                        self._buffer = self._buffer[INTERLEAVED_HEADER_LEN + length :]
+                        del buffer[: INTERLEAVED_HEADER_LEN + length]
@@ -1,4 +1,9 @@
-from typing import List
+import logging
+
+from typing import List, Dict
+
+
+logger = logging.getLogger(__name__)
 
 
 def get_sdp_medias(sdp: dict) -> List[dict]:
@@ -14,3 +19,23 @@ def get_payload_type_from_sdp_media(sdp_media: dict) -> int:
 def get_codec_name_from_sdp_media(sdp_media: dict) -> str:
     assert "rtp" in sdp_media and sdp_media["rtp"] and "codec" in sdp_media["rtp"][0]
     return sdp_media["rtp"][0]["codec"]
+
+
+def get_sdp_medias_by_payload_type(sdp: dict) -> Dict[int, dict]:
+    """
+    Map each payload type to the first SDP media that uses it.
+    Medias with more than one payload type are not supported and are skipped.
+    """
+    sdp_medias_by_payload_type: Dict[int, dict] = {}
+    for sdp_media in get_sdp_medias(sdp):
+        if not isinstance(sdp_media.get("payloads"), int):
+            logger.warning(
+                "Skipping SDP media with unsupported payloads: %s",
+                sdp_media.get("payloads"),
+            )
+            continue
+
+        payload_type = get_payload_type_from_sdp_media(sdp_media)
+        sdp_medias_by_payload_type.setdefault(payload_type, sdp_media)
+
+    return sdp_medias_by_payload_type